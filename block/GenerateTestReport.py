@@ -5,8 +5,8 @@
 # StoragePerformanceTest.py should do:
 # 1. the fio outputs should be at least in json+ format
 #    the "fio --group_reporting" must be used
-# 2. save the fio outputs into *.fiolog
-# 3. put all *.fiolog files into the spcified path
+# 2. save the fio outputs into *.fiolog.json (or *.fiolog for legacy)
+# 3. put all the fio log files into the spcified path
 # 4. pass the additional information by "fio --description"
 #    a) "driver" - frontend driver, such as SCSI or IDE
 #    b) "format" - the disk format, such as raw or xfs
@@ -33,14 +33,26 @@ v2.6.1  2019-12-30  charles.shih  Add "NaN" to the report if disk utils
                                   unavailable
 v2.6.2  2019-12-30  charles.shih  Remove temporary files after parsing fiolog
 v2.7    2020-07-13  charles.shih  Fix a bug to handle fio-3.19 json outputs
+v2.8    2026-10-15  charles.shih  Load the json+ only outputs (*.fiolog.json)
+                                  directly.
+v2.8.1  2026-10-15  charles.shih  Remove the dead code for Python 2.
+v2.9    2026-10-15  charles.shih  Parse the description in json format.
+v2.9.1  2026-10-15  charles.shih  Extract the tarballs into a temporary
+                                  directory by tarfile.
 """
 
 import json
 import re
 import os
+import shutil
+import tarfile
+import tempfile
 import click
 import pandas as pd
 
+# The suffixes of the fio log files, *.fiolog is for legacy.
+FIO_LOG_SUFFIXES = ('.fiolog', '.fiolog.json')
+
 
 class FioTestReporter():
     """FIO Test Reporter.
@@ -69,36 +81,14 @@ class FioTestReporter():
     # by Pandas.
     df_report = None
 
-    def _byteify(self, inputs):
-        """Convert unicode to utf-8 string.
-
-        This function converts the unicode string to bytes.
-
-        Args:
-            inputs: the object which contain unicode.
-
-        Returns:
-            The byteify version of inputs.
-
-        """
-        if isinstance(inputs, dict):
-            return {
-                self._byteify(key): self._byteify(value)
-                for key, value in inputs.items()
-            }
-        elif isinstance(inputs, list):
-            return [self._byteify(element) for element in inputs]
-        elif isinstance(inputs, str):
-            return inputs.encode('utf-8')
-        else:
-            return inputs
-
     def _get_raw_data_from_fio_log(self, data_file):
         """Get the raw data from a specified fio log file.
 
         This function open a specified fio log file and read the first json
         block which is expected to be generated by the fio --output=json/json+.
         Then it converts this block into Python dict format and returns it.
+        The *.fiolog.json file contains the json block only, so that it will
+        be loaded directly, unless fio wrote some messages ahead of it.
 
         Args:
             data_file: string, the path to the fio log file.
@@ -121,6 +111,18 @@ class FioTestReporter():
             print('[ERROR] Missing required params: data_file')
             return (1, None)
 
+        # Load the json+ only outputs directly, locate the json block below
+        # if fio wrote some messages (such as "note:" lines) ahead of it
+        if data_file.endswith('.json'):
+            try:
+                with open(data_file, 'r') as f:
+                    return (0, json.load(f))
+            except ValueError:
+                pass
+            except Exception as err:
+                print('[ERROR] Error while handling the json file: %s' % err)
+                return (1, None)
+
         # Get the offsets of the first json block
         try:
             with open(data_file, 'r') as f:
@@ -152,13 +154,7 @@ class FioTestReporter():
             with open(data_file + '.json', 'w') as json_file:
                 json_file.writelines(file_content[begin:end + 1])
             with open(data_file + '.json', 'r') as json_file:
-                json_data = json.load(json_file)
-                if '' == b'':
-                    # Convert to byteify for Python 2
-                    raw_data = self._byteify(json_data)
-                else:
-                    # Keep strings for Python 3
-                    raw_data = json_data
+                raw_data = json.load(json_file)
 
         except Exception as err:
             print('[ERROR] Error while handling the new json file: %s' % err)
@@ -190,27 +186,55 @@ class FioTestReporter():
             print('[ERROR] Missing required params: params[result_path]')
             return 1
 
-        # Load raw data from files
-        for fname in os.listdir(params['result_path']):
-            filename = params['result_path'] + os.sep + fname
+        # Load raw data from files, the temporary files will be removed
+        # along with the tmpfolder
+        with tempfile.TemporaryDirectory(prefix='fio-report-') as tmpfolder:
+            for fname in os.listdir(params['result_path']):
+                filename = params['result_path'] + os.sep + fname
 
-            tmpfolder = '/tmp/fio-report.tmp'
-            if filename.endswith('.tar.gz') and os.path.isfile(filename):
-                os.system('mkdir -p {0}'.format(tmpfolder))
-                os.system('tar xf {1} -C {0}'.format(tmpfolder, filename))
-                filename = tmpfolder + os.sep + fname.replace(
-                    '.tar.gz', '.fiolog')
+                # Tarball support
+                if filename.endswith('.tar.gz') and os.path.isfile(filename):
+                    filename = self._extract_fio_log(filename, tmpfolder)
 
-            if filename.endswith('.fiolog') and os.path.isfile(filename):
-                (result, raw_data) = self._get_raw_data_from_fio_log(filename)
-                if result == 0:
-                    self.raw_data_list.append(raw_data)
-
-            # Remove temporary files
-            os.system('[ -e {0} ] && rm -rf {0}'.format(tmpfolder))
+                if filename.endswith(FIO_LOG_SUFFIXES) and os.path.isfile(
+                        filename):
+                    (result,
+                     raw_data) = self._get_raw_data_from_fio_log(filename)
+                    if result == 0:
+                        self.raw_data_list.append(raw_data)
 
         return 0
 
+    def _extract_fio_log(self, tarball, path):
+        """Extract the fio log file from a specified tarball.
+
+        The *.fiolog.json file (or *.fiolog for legacy) named after the
+        tarball will be extracted into the specified path.
+
+        Args:
+            tarball: string, the path to the tarball.
+            path: string, the path to extract the fio log file to.
+
+        Returns:
+            The path to the extracted fio log file, or '' if not found.
+
+        """
+        try:
+            with tarfile.open(tarball, 'r:gz') as tf:
+                names = tf.getnames()
+                basename = os.path.basename(tarball)
+                for suffix in ('.fiolog.json', '.fiolog'):
+                    name = basename.replace('.tar.gz', suffix)
+                    if name in names:
+                        filename = path + os.sep + name
+                        with open(filename, 'wb') as f:
+                            shutil.copyfileobj(tf.extractfile(name), f)
+                        return filename
+        except Exception as err:
+            print('[ERROR] Error while extracting the tarball: %s' % err)
+
+        return ''
+
     def _get_kpis_from_raw_data(self, raw_data):
         """Get KPIs from a specified raw data.
 
@@ -293,7 +317,12 @@ class FioTestReporter():
 
             # Get additional information
             try:
-                dict = eval(raw_data['jobs'][0]['job options']['description'])
+                description = raw_data['jobs'][0]['job options']['description']
+                try:
+                    dict = json.loads(description)
+                except ValueError:
+                    # The legacy logs use Python dict format
+                    dict = eval(description)
                 perf_kpi.update(dict)
             except Exception as err:
                 print(
@@ -474,7 +503,7 @@ def generate_fio_test_report(result_path, report_csv):
     """Generate FIO test report."""
     fioreporter = FioTestReporter()
 
-    # Load raw data from *.fiolog files
+    # Load raw data from *.fiolog.json and *.fiolog files
     return_value = fioreporter.load_raw_data_from_fio_logs(
         {'result_path': result_path})
     if return_value:
@@ -500,7 +529,8 @@ def generate_fio_test_report(result_path, report_csv):
 @click.command()
 @click.option('--result_path',
               type=click.Path(exists=True),
-              help='Specify the path where *.fiolog files are stored in.')
+              help='Specify the path where *.fiolog(.json) files are \
+stored in.')
 @click.option('--report_csv',
               type=click.Path(),
               help='Specify the name of CSV file for fio test reports.')
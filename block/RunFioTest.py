@@ -5,8 +5,8 @@
 # This script should do:
 # 1. the fio outputs should be at least in json+ format
 #    the "fio --group_reporting" must be used
-# 2. save the fio outputs into *.fiolog
-# 3. put all *.fiolog files into the spcified path
+# 2. save the fio outputs into *.fiolog.json
+# 3. put all *.fiolog.json files into the spcified path
 # 4. pass the additional information by "fio --description"
 #    a) "driver" - frontend driver, such as SCSI or IDE
 #    b) "format" - the disk format, such as raw or xfs
@@ -44,11 +44,34 @@ v2.2.1  2020-03-13  charles.shih  PEP-8 Formatting.
 v2.3    2020-07-22  charles.shih  Name all files uniformly.
 v2.4    2020-07-22  charles.shih  Technical Preview, wait before collection.
 v2.5    2020-07-22  charles.shih  Log the fio command.
+v2.6    2026-10-15  charles.shih  Support io_uring specific options.
+v2.7    2026-10-15  charles.shih  Support running sub-cases in a batch.
+v2.8    2026-10-15  charles.shih  Support testing devices in parallel.
+v2.9    2026-10-15  charles.shih  Save the json+ outputs only (*.fiolog.json).
+v2.10   2026-10-15  charles.shih  Support NVMe passthrough with io_uring_cmd.
+v2.10.1 2026-10-15  charles.shih  Move the invariants out of the job loops.
+v2.11   2026-10-15  charles.shih  Check the parameters by a schema.
+v2.11.1 2026-10-15  charles.shih  Drop the Python 2 leftovers, load the yaml
+                                  file safely.
+v2.12   2026-10-15  charles.shih  Run fio without the shell, pass the metadata
+                                  as json.
+v2.12.1 2026-10-15  charles.shih  Format the invariant parts of the case names
+                                  once per round.
+v2.12.2 2026-10-15  charles.shih  Cache the yaml file, parse it by the C loader
+                                  if there is.
 """
 
 import os
+import re
+import sys
+import stat
 import time
+import json
+import shlex
 import itertools
+import subprocess
+import functools
+import concurrent.futures
 import yaml
 import click
 
@@ -59,10 +82,44 @@ class FioTestRunner:
     This class used to run the fio test cases. As basic functions:
     1. It loads all the needed parameters from dict named 'params';
     2. It splits the test suites into sub-cases and run them one by one;
-    3. It generates the fio test report as log files ending with '.fiolog';
+    3. It generates the fio test report as log files ending with
+       '.fiolog.json';
 
     """
 
+    # The schema of the parameters, each item is a tuple like:
+    # (name, types, check, default, hint)
+    # name: the name of the parameter;
+    # types: the allowed types of the parameter;
+    # check: an additional check of the value, None for no check;
+    # default: the default value, None for a required parameter;
+    # hint: the message to show if the parameter is invalid.
+    _SCHEMA = [
+        ('backend', str, None, None, 'string'),
+        ('driver', str, None, None, 'string'),
+        ('fs', str, None, None, 'string'),
+        ('rounds', int, lambda x: x >= 1, None, 'an integer >= 1'),
+        ('filename', str, None, '', 'string'),
+        ('filename_list', (list, tuple), None, (), 'a list or tuple'),
+        ('parallel_devices', int, lambda x: x >= 1, 1, 'an integer >= 1'),
+        ('runtime', str, None, None, 'string'),
+        ('ioengine', str, None, None, 'string'),
+        ('hipri', bool, None, False, 'bool'),
+        ('fixedbufs', bool, None, False, 'bool'),
+        ('registerfiles', bool, None, False, 'bool'),
+        ('sqthread_poll', bool, None, False, 'bool'),
+        ('passthrough', bool, None, False, 'bool'),
+        ('direct', int, lambda x: x in (0, 1), None, 'integer 0 or 1'),
+        ('numjobs', int, None, None, 'an integer'),
+        ('rw_list', (list, tuple), None, None, 'a list or tuple'),
+        ('bs_list', (list, tuple), None, None, 'a list or tuple'),
+        ('iodepth_list', (list, tuple), None, None, 'a list or tuple'),
+        ('log_path', str, None, None, 'string'),
+        ('plots', bool, None, False, 'bool'),
+        ('dryrun', bool, None, False, 'bool'),
+        ('batch', bool, None, False, 'bool'),
+    ]
+
     # Initialize the test runner
     def __init__(self, params={}):
         """Initialize this Class.
@@ -84,10 +141,35 @@ class FioTestRunner:
                     How many rounds the fio test will be repeated.
                 filename: str
                     [FIO] The disk or specified file(s) to be tested by fio.
+                    Required if the filename_list is not specified.
+                filename_list: list
+                    [FIO] The independent disks or files to be tested, each
+                    of them will be tested by separated fio jobs. It takes
+                    precedence over the filename if specified.
+                parallel_devices: int
+                    How many devices in the filename_list will be tested
+                    concurrently. If so, the caches are dropped only once
+                    before all the tests, and the CPU idleness and SAR logs
+                    are not collected.
                 runtime: str
                     [FIO] Terminate a job after the specified period of time.
                 ioengine: str
                     [FIO] Defines how the job issues I/O to the file.
+                hipri: bool
+                    [FIO] Use polled I/O completions (io_uring only).
+                fixedbufs: bool
+                    [FIO] Use pre-registered I/O buffers (io_uring only).
+                registerfiles: bool
+                    [FIO] Register the files with the kernel (io_uring only).
+                sqthread_poll: bool
+                    [FIO] Offload the submission to a kernel thread which
+                    polls the SQ ring (io_uring only).
+                passthrough: bool
+                    [FIO] Use the io_uring_cmd ioengine to issue NVMe
+                    passthrough commands to the /dev/ng* character devices.
+                    Requires Linux 5.19 or later. Using hipri or fixedbufs
+                    with it requires Linux 6.1 or later, and hipri also
+                    requires the NVMe poll queues (nvme.poll_queues > 0).
                 direct: int
                     [FIO] Direct access to the disk.
                     Example: '0' (using cache), '1' (direct access).
@@ -103,149 +185,46 @@ class FioTestRunner:
                     [FIO] # of I/O units to keep in flight against the file.
                     Example: '1, 8, 64'...
                 log_path: str
-                    Where the *.fiolog files will be saved to.
+                    Where the *.fiolog.json files will be saved to.
                 plots: bool
                     Generate bw/iops/lat logs and plots in their lifetime.
                 dryrun: bool
                     Print the commands that would be executed, but do not
                     execute them.
+                batch: bool
+                    Run all the sub-cases in a single fio invocation. If so,
+                    the caches are dropped once per batch rather than before
+                    each sub-case, the SAR logs are not collected, and the
+                    disk utilization is not reported.
         Returns:
             None
 
         """
         # Parse Args
-        if 'backend' not in params:
-            print('[ERROR] Missing required params: params[backend]')
-            exit(1)
-        elif type(params['backend']) not in (type(u''), type(b'')):
-            print('[ERROR] params[backend] must be string.')
-            exit(1)
-        else:
-            self.backend = params['backend']
-
-        if 'driver' not in params:
-            print('[ERROR] Missing required params: params[driver]')
-            exit(1)
-        elif type(params['driver']) not in (type(u''), type(b'')):
-            print('[ERROR] params[driver] must be string.')
-            exit(1)
-        else:
-            self.driver = params['driver']
-
-        if 'fs' not in params:
-            print('[ERROR] Missing required params: params[fs]')
-            exit(1)
-        elif type(params['fs']) not in (type(u''), type(b'')):
-            print('[ERROR] params[fs] must be string.')
-            exit(1)
-        else:
-            self.fs = params['fs']
-
-        if 'rounds' not in params:
-            print('[ERROR] Missing required params: params[rounds]')
-            exit(1)
-        elif not isinstance(params['rounds'], int) or params['rounds'] < 1:
-            print('[ERROR] params[rounds] must be an integer >= 1.')
-            exit(1)
-        else:
-            self.rounds = params['rounds']
+        for (name, types, check, default, hint) in self._SCHEMA:
+            if name not in params:
+                if default is None:
+                    print('[ERROR] Missing required params: params[%s]' % name)
+                    sys.exit(1)
+                setattr(self, name, default)
+            elif not isinstance(params[name], types) or (
+                    check and not check(params[name])):
+                print('[ERROR] params[%s] must be %s.' % (name, hint))
+                sys.exit(1)
+            else:
+                setattr(self, name, params[name])
 
-        if 'filename' not in params:
+        # The filename is required only if there is no filename_list
+        if not self.filename_list and not self.filename:
             print('[ERROR] Missing required params: params[filename]')
-            exit(1)
-        elif type(params['filename']) not in (type(u''), type(b'')):
-            print('[ERROR] params[filename] must be string.')
-            exit(1)
-        else:
-            self.filename = params['filename']
-
-        if 'runtime' not in params:
-            print('[ERROR] Missing required params: params[runtime]')
-            exit(1)
-        elif type(params['runtime']) not in (type(u''), type(b'')):
-            print('[ERROR] params[runtime] must be string.')
-            exit(1)
-        else:
-            self.runtime = params['runtime']
-
-        if 'ioengine' not in params:
-            print('[ERROR] Missing required params: params[ioengine]')
-            exit(1)
-        elif type(params['ioengine']) not in (type(u''), type(b'')):
-            print('[ERROR] params[ioengine] must be string.')
-            exit(1)
-        else:
-            self.ioengine = params['ioengine']
-
-        if 'direct' not in params:
-            print('[ERROR] Missing required params: params[direct]')
-            exit(1)
-        elif not params['direct'] in (0, 1):
-            print('[ERROR] params[direct] must be integer 0 or 1.')
-            exit(1)
-        else:
-            self.direct = params['direct']
-
-        if 'numjobs' not in params:
-            print('[ERROR] Missing required params: params[numjobs]')
-            exit(1)
-        elif not isinstance(params['numjobs'], int):
-            print('[ERROR] params[numjobs] must be an integer.')
-            exit(1)
-        else:
-            self.numjobs = params['numjobs']
-
-        if 'rw_list' not in params:
-            print('[ERROR] Missing required params: params[rw_list]')
-            exit(1)
-        elif not isinstance(params['rw_list'], (list, tuple)):
-            print('[ERROR] params[rw_list] must be a list or tuple.')
-            exit(1)
-        else:
-            self.rw_list = params['rw_list']
-
-        if 'bs_list' not in params:
-            print('[ERROR] Missing required params: params[bs_list]')
-            exit(1)
-        elif not isinstance(params['bs_list'], (list, tuple)):
-            print('[ERROR] params[bs_list] must be a list or tuple.')
-            exit(1)
-        else:
-            self.bs_list = params['bs_list']
-
-        if 'iodepth_list' not in params:
-            print('[ERROR] Missing required params: params[iodepth_list]')
-            exit(1)
-        elif not isinstance(params['iodepth_list'], (list, tuple)):
-            print('[ERROR] params[iodepth_list] must be a list or tuple.')
-            exit(1)
-        else:
-            self.iodepth_list = params['iodepth_list']
-
-        if 'log_path' not in params:
-            print('[ERROR] Missing required params: params[log_path]')
-            exit(1)
-        elif type(params['log_path']) not in (type(u''), type(b'')):
-            print('[ERROR] params[log_path] must be string.')
-            exit(1)
-        else:
-            self.log_path = params['log_path']
-
-        if 'plots' not in params:
-            self.plots = False
-        elif not isinstance(params['plots'], bool):
-            print('[ERROR] params[plots] must be bool.')
-            exit(1)
-        else:
-            self.plots = params['plots']
+            sys.exit(1)
 
-        if 'dryrun' not in params:
-            self.dryrun = False
-        elif not isinstance(params['dryrun'], bool):
-            print('[ERROR] params[dryrun] must be bool.')
-            exit(1)
-        else:
-            self.dryrun = params['dryrun']
+        # The sub-cases of each target must be distinguishable
+        fs_tags = [self._get_fs_tag(x) for x in self.filename_list]
+        if len(set(fs_tags)) != len(fs_tags):
+            print('[ERROR] params[filename_list] must not contain the targets \
+with the same name (%s).' % ', '.join(fs_tags))
+            sys.exit(1)
 
         # Init variables
         self.jobs = []
@@ -259,6 +238,7 @@ class FioTestRunner:
         This function splits the parameters for running the fio tests.
 
         It will do Cartesian product with the following itmes:
+        - self.filename_list (or self.filename)
         - self.rounds
         - self.bs_list
         - self.iodepth_list
@@ -279,114 +259,115 @@ class FioTestRunner:
         self.path = os.path.expanduser(self.log_path)
 
         # Technical Preview
-        support_idleness = True
-        support_sar = True
+        # The caches, CPU idleness and SAR logs are system-wide, they won't
+        # be handled for each job if the devices are tested concurrently.
+        support_idleness = not self._is_concurrent()
+        support_sar = not self._is_concurrent()
 
         # Split parameters
-        param_tuples = itertools.product(list(range(1, self.rounds + 1)),
-                                         self.bs_list, self.iodepth_list,
-                                         self.rw_list)
+        targets = self.filename_list or [self.filename]
+
+        # Run all the sub-cases by a single fio command for each target
+        if self.batch:
+            for target in targets:
+                self._split_tests_in_batch(target)
+            return None
 
         # Generate command for all the tests
-        jobnum = 0
-        for param_tuple in param_tuples:
-            (rd, bs, iodepth, rw) = param_tuple
-
-            command = pre_command = post_command = ''
-
-            # Set case and log file name
-            casename = 'fio_%s_%s_%s_%s_%s_%s_%s_%s_%s_%s' % (
-                self.backend, self.driver, self.fs, self.ioengine, rw, bs,
-                iodepth, self.numjobs, rd,
-                time.strftime('%Y%m%d%H%M%S', time.localtime()))
-            output_path = self.path + os.sep + casename
-            output = output_path + os.sep + casename + '.fiolog'
-
-            # Build fio command
-            command = 'fio'
-            command += ' --name=%s' % casename
-            command += ' --filename=%s' % self.filename
-            command += ' --size=80G'
-            command += ' --ioengine=%s' % self.ioengine
-            command += ' --direct=%s' % self.direct
-            command += ' --rw=%s' % rw
-            command += ' --bs=%s' % bs
-            command += ' --iodepth=%s' % iodepth
-            command += ' --numjobs=%s' % self.numjobs
-            command += ' --time_based'
-            command += ' --runtime=%s' % self.runtime
-            command += ' --group_reporting'
-            command += ' --output-format=normal,json+'
-            command += ' --output=%s' % output
+        timestamp = time.strftime('%Y%m%d%H%M%S', time.localtime())
+        cases = itertools.chain.from_iterable(
+            self._split_cases(x, timestamp) for x in targets)
+        for (filename, casename, rd, bs, iodepth, rw) in cases:
+            pre_command = post_command = ''
+
+            # Set log file name
+            output_path = f'{self.path}{os.sep}{casename}'
+            output = f'{output_path}{os.sep}{casename}.fiolog.json'
+
+            # Build fio command (argv, executed without the shell)
+            command = ['fio', f'--name={casename}', f'--filename={filename}',
+                       '--size=80G']
+            command += [f'--{x}' for x in self._get_ioengine_options(filename)]
+            command += [
+                f'--direct={self.direct}', f'--rw={rw}', f'--bs={bs}',
+                f'--iodepth={iodepth}', f'--numjobs={self.numjobs}',
+                '--time_based', f'--runtime={self.runtime}',
+                '--group_reporting', '--output-format=json+',
+                f'--output={output}'
+            ]
 
             # Reuse 'description' to integrate some metadata
-            command += ' --description="%s"' % {
-                'backend': self.backend,
-                'driver': self.driver,
-                'format': self.fs,
-                'round': rd
-            }
+            command.append('--description=' +
+                           self._get_description(filename, rd))
 
             # Technical Preview: Collect CPU idleness
             if support_idleness and not support_sar:
-                command += ' --idle-prof=percpu'
+                command.append('--idle-prof=percpu')
 
             # Technical Preview: Wait before collection
-            command += ' --ramp_time=20'
+            command.append('--ramp_time=20')
 
             # Generate bw/iops/lat logs in their lifetime for the plots
             if self.plots:
-                prefix = output_path + os.sep + casename
-                command += ' --write_bw_log=%s' % prefix
-                command += ' --write_iops_log=%s' % prefix
-                command += ' --write_lat_log=%s' % prefix
-                command += ' --log_avg_msec=500'
-                command += ' --per_job_logs=1'
+                prefix = f'{output_path}{os.sep}{casename}'
+                command += [
+                    f'--write_bw_log={prefix}', f'--write_iops_log={prefix}',
+                    f'--write_lat_log={prefix}', '--log_avg_msec=500',
+                    '--per_job_logs=1'
+                ]
 
             # Parse options only, don't start any I/O
-            # command += ' --parse-only'  # (comment this line for testing)
+            # command.append('--parse-only')  # (comment this line for testing)
+
+            # Quote the names for the shell commands
+            qpath = shlex.quote(output_path)
+            qname = shlex.quote(casename)
 
             # Set pre-command
-            pre_command += 'mkdir -p %s; cd %s; ' % (output_path, output_path)
+            pre_command += 'mkdir -p %s; cd %s; ' % (qpath, qpath)
             # Drop caches
-            pre_command += 'sync; echo 3 > /proc/sys/vm/drop_caches; '
+            if not self._is_concurrent():
+                pre_command += 'sync; echo 3 > /proc/sys/vm/drop_caches; '
 
             # Technical Preview: SAR
             if support_sar:
-                pre_command += 'sar -A 1 -o %s.sa &>/dev/null & ' % casename
+                pre_command += 'sar -A 1 -o %s.sa &>/dev/null & ' % qname
+                pre_command += 'echo $! > %s.sar.pid; ' % qname
 
             # Set post-command
             if self.plots:
                 post_command += 'export PATH=$PATH:$PWD/utils/; '
-                post_command += 'pushd %s &>/dev/null; ' % output_path
-                post_command += 'generate_plots.sh %s &>/dev/null; ' % casename
+                post_command += 'pushd %s &>/dev/null; ' % qpath
+                post_command += 'generate_plots.sh %s &>/dev/null; ' % qname
                 post_command += 'popd &>/dev/null; '
 
             # Technical Preview: SAR
             if support_sar:
-                post_command += 'pushd %s &>/dev/null; ' % output_path
-                post_command += 'killall sar; '
-                post_command += 'sar -f %s.sa -u > %s-sa_cpu.log; ' % (
-                    casename, casename)
+                post_command += 'pushd %s &>/dev/null; ' % qpath
+                post_command += 'kill $(cat %s.sar.pid); ' % qname
+                post_command += 'rm -f %s.sar.pid; ' % qname
+                post_command += 'sar -f %s.sa -u > %s-sa_cpu.log; ' % (qname,
+                                                                       qname)
                 post_command += 'popd &>/dev/null; '
 
             # Log the fio command
-            post_command += 'pushd %s &>/dev/null; ' % output_path
-            post_command += 'echo %s > %s.cmd; ' % (command, casename)
+            post_command += 'pushd %s &>/dev/null; ' % qpath
+            post_command += 'echo %s > %s.cmd; ' % (shlex.quote(
+                shlex.join(command)), qname)
             post_command += 'popd &>/dev/null; '
 
             # Collect log files and create tarball
-            post_command += 'pushd %s &>/dev/null' % output_path
-            post_command += ' && tar zcf %s.tar.gz *; ' % casename
+            post_command += 'pushd %s &>/dev/null' % qpath
+            post_command += ' && tar zcf %s.tar.gz *; ' % qname
             post_command += 'popd &>/dev/null; '
-            post_command += 'mv -t %s %s/%s.tar.gz' % (self.path, output_path,
-                                                       casename)
-            post_command += ' && rm -r %s; ' % output_path
+            post_command += 'mv -t %s %s/%s.tar.gz' % (shlex.quote(self.path),
+                                                       qpath, qname)
+            post_command += ' && rm -r %s; ' % qpath
 
             # save the current test command into jobs
-            jobnum += 1
             self.jobs.append({
-                'jobnum': jobnum,
+                'jobnum': len(self.jobs) + 1,
+                'device': filename,
                 'command': command,
                 'pre_command': pre_command,
                 'post_command': post_command,
@@ -397,34 +378,365 @@ class FioTestRunner:
 
         return None
 
-    def start(self):
-        """Start to run all tests in the job list."""
-        if not self.jobs:
-            self._split_tests()
+    def _split_cases(self, filename, timestamp):
+        """Split the sub-cases for a specified target.
+
+        This function does Cartesian product with self.rounds, self.bs_list,
+        self.iodepth_list and self.rw_list. The invariant parts of the case
+        name are formatted once per target and per round.
+
+        Args:
+            filename: str, the disk or file(s) to be tested.
+            timestamp: str, the timestamp in the case names.
+
+        Yields:
+            The tuple (filename, casename, rd, bs, iodepth, rw).
+
+        """
+        fs_tag = self._get_fs_tag(filename)
+        ioengine = self._get_ioengine(filename)
+        prefix = f'fio_{self.backend}_{self.driver}_{fs_tag}_{ioengine}'
+
+        for rd in range(1, self.rounds + 1):
+            suffix = f'{self.numjobs}_{rd}_{timestamp}'
+            for (bs, iodepth, rw) in itertools.product(
+                    self.bs_list, self.iodepth_list, self.rw_list):
+                yield (filename, f'{prefix}_{rw}_{bs}_{iodepth}_{suffix}', rd,
+                       bs, iodepth, rw)
+
+    def _is_concurrent(self):
+        """Check if the devices in the filename_list run concurrently."""
+        return self.parallel_devices > 1 and len(self.filename_list) > 1
+
+    def _get_fs_tag(self, filename):
+        """Get the fs part of the case name for a specified target.
+
+        The target name is appended when testing the filename_list, so that
+        the sub-cases running concurrently are distinguishable. The whole
+        path is used with the separators stripped, such as "mnt1tmpf.img"
+        for "/mnt1/tmp/f.img". The other characters which are not safe for
+        the file names are replaced by '_'.
+
+        """
+        if self.filename_list:
+            name = filename.replace(os.sep, '').replace(':', '')
+            return '%s_%s' % (self.fs, re.sub(r'[^A-Za-z0-9_.-]', '_', name))
+        return self.fs
+
+    def _is_passthrough(self, filename):
+        """Check if the NVMe passthrough applies to a specified target."""
+        return self.passthrough and all(
+            x.startswith('/dev/ng') for x in filename.split(':'))
+
+    def _get_description(self, filename, rd):
+        """Get the metadata passed by the fio description in json format.
+
+        The "format" goes with the fs tag, so that the results of the
+        targets in the filename_list are distinguishable in the reports.
+
+        """
+        return json.dumps({
+            'backend': self.backend,
+            'driver': self.driver,
+            'format': self._get_fs_tag(filename),
+            'round': rd
+        })
+
+    def _get_ioengine(self, filename):
+        """Get the ioengine for a specified target."""
+        if self._is_passthrough(filename):
+            return 'io_uring_cmd'
+        return self.ioengine
+
+    def _get_ioengine_options(self, filename):
+        """Get the ioengine related fio options for a specified target.
+
+        Args:
+            filename: str, the disk or file(s) to be tested.
+
+        Returns:
+            The list of fio options without the leading '--'.
+
+        """
+        # NVMe passthrough, bypass the generic block layer
+        if self._is_passthrough(filename):
+            options = ['ioengine=io_uring_cmd', 'cmd_type=nvme']
+        elif self.ioengine == 'io_uring':
+            options = ['ioengine=io_uring']
+        else:
+            return ['ioengine=%s' % self.ioengine]
+
+        # The io_uring specific options
+        if self.hipri:
+            options.append('hipri')
+        if self.fixedbufs:
+            options.append('fixedbufs')
+        if self.registerfiles:
+            options.append('registerfiles')
+        if self.sqthread_poll:
+            options.append('sqthread_poll=1')
+
+        return options
+
+    def _check_passthrough_targets(self):
+        """Check the targets before running the NVMe passthrough tests.
+
+        Returns:
+            0: Passed
+            1: Failed
+
+        """
+        if not self.passthrough:
+            return 0
+
+        for filename in self.filename_list or [self.filename]:
+            if not self._is_passthrough(filename):
+                print('[WARNING] NVMe passthrough is only available for the \
+/dev/ng* devices, "%s" will be tested by "%s".' % (filename, self.ioengine))
+                continue
+
+            for device in filename.split(':'):
+                try:
+                    mode = os.stat(device).st_mode
+                except Exception as err:
+                    print('[ERROR] Error while checking the device: %s' % err)
+                    return 1
+
+                if not stat.S_ISCHR(mode):
+                    print('[ERROR] "%s" is not a character device.' % device)
+                    return 1
+
+        return 0
+
+    def _emit_jobfile(self, filename, cases):
+        """Emit the fio job file for running sub-cases in a batch.
+
+        The common options go to the [global] section, and each sub-case
+        is defined by a stonewalled job section, so that the sub-cases run
+        one by one and each of them gets its own group report.
+
+        Args:
+            filename: str, the disk or file(s) to be tested.
+            cases: list of tuple (casename, rd, bs, iodepth, rw, prefix)
+                prefix is the bw/iops/lat logs prefix for the plots.
+
+        Returns:
+            The content of the fio job file.
+
+        """
+        lines = ['[global]']
+        lines.append('filename=%s' % filename)
+        lines.append('size=80G')
+        lines.extend(self._get_ioengine_options(filename))
+        lines.append('direct=%s' % self.direct)
+        lines.append('time_based')
+        lines.append('runtime=%s' % self.runtime)
+        lines.append('group_reporting')
+
+        # Technical Preview: Wait before collection
+        lines.append('ramp_time=20')
+
+        if self.plots:
+            lines.append('log_avg_msec=500')
+            lines.append('per_job_logs=1')
+
+        for (casename, rd, bs, iodepth, rw, prefix) in cases:
+            lines.append('')
+            lines.append('[%s]' % casename)
+            lines.append('stonewall')
+            lines.append('rw=%s' % rw)
+            lines.append('bs=%s' % bs)
+            lines.append('iodepth=%s' % iodepth)
+            # Keep it here so that it appears in the 'job options' of log
+            lines.append('numjobs=%s' % self.numjobs)
 
-        jobnum = 0
+            # Reuse 'description' to integrate some metadata
+            lines.append('description=%s' %
+                         self._get_description(filename, rd))
+
+            # Generate bw/iops/lat logs in their lifetime for the plots
+            if self.plots:
+                lines.append('write_bw_log=%s' % prefix)
+                lines.append('write_iops_log=%s' % prefix)
+                lines.append('write_lat_log=%s' % prefix)
+
+        return '\n'.join(lines) + '\n'
+
+    def _split_tests_in_batch(self, filename):
+        """Create a single job which runs all the sub-cases.
+
+        The sub-cases are written into a fio job file and executed by one
+        fio process, the combined json+ output will be split into
+        *.fiolog.json files for each sub-case after the test. Each of them
+        is packed into a tarball named after the sub-case, along with its
+        bw/iops/lat logs and plots, just like running the sub-cases one by
+        one. The tarball named after the batch keeps all the logs.
+
+        Args:
+            filename: str, the disk or file(s) to be tested.
+
+        Returns:
+            None
+
+        Updates:
+            self.jobs: the job list.
+
+        """
+        # Set batch name and log file name
+        timestamp = time.strftime('%Y%m%d%H%M%S', time.localtime())
+        fs_tag = self._get_fs_tag(filename)
+        ioengine = self._get_ioengine(filename)
+        batchname = (f'fio_{self.backend}_{self.driver}_{fs_tag}_'
+                     f'{ioengine}_batch_{timestamp}')
+        output_path = f'{self.path}{os.sep}{batchname}'
+        output = f'{output_path}{os.sep}{batchname}.fiolog.batch'
+        jobfile = f'{output_path}{os.sep}{batchname}.fio'
+
+        # Generate sub-cases
+        cases = []
+        for (_, casename, rd, bs, iodepth, rw) in self._split_cases(
+                filename, timestamp):
+            prefix = f'{output_path}{os.sep}{casename}'
+            cases.append((casename, rd, bs, iodepth, rw, prefix))
+
+        # Build fio command
+        command = [
+            'fio', '--output-format=json+', f'--output={output}', jobfile
+        ]
+
+        # Quote the names for the shell commands
+        qpath = shlex.quote(output_path)
+        qname = shlex.quote(batchname)
+
+        # Set pre-command
+        pre_command = 'mkdir -p %s; cd %s; ' % (qpath, qpath)
+        # Drop caches
+        if not self._is_concurrent():
+            pre_command += 'sync; echo 3 > /proc/sys/vm/drop_caches; '
+
+        # Set post-command
+        post_command = ''
+        if self.plots:
+            post_command += 'export PATH=$PATH:$PWD/utils/; '
+            post_command += 'pushd %s &>/dev/null; ' % qpath
+            for case in cases:
+                post_command += 'generate_plots.sh %s &>/dev/null; ' % (
+                    shlex.quote(case[0]))
+            post_command += 'popd &>/dev/null; '
+
+        # Log the fio command
+        post_command += 'pushd %s &>/dev/null; ' % qpath
+        post_command += 'echo %s > %s.cmd; ' % (shlex.quote(
+            shlex.join(command)), qname)
+        post_command += 'popd &>/dev/null; '
+
+        # Collect log files and create tarballs for the batch and sub-cases
+        post_command += 'pushd %s &>/dev/null' % qpath
+        post_command += ' && tar zcf %s.tar.gz *' % qname
+        for case in cases:
+            post_command += ' && tar zcf {0}.tar.gz {0}[._]*'.format(
+                shlex.quote(case[0]))
+        post_command += '; popd &>/dev/null; '
+        post_command += 'mv -t %s %s/*.tar.gz' % (shlex.quote(self.path),
+                                                  qpath)
+        post_command += ' && rm -r %s; ' % qpath
+
+        # save the batch command into jobs
+        self.jobs.append({
+            'jobnum': len(self.jobs) + 1,
+            'device': filename,
+            'command': command,
+            'pre_command': pre_command,
+            'post_command': post_command,
+            'jobfile': jobfile,
+            'jobfile_content': self._emit_jobfile(filename, cases),
+            'output': output,
+            'status': 'NOTRUN',
+            'start': None,
+            'stop': None
+        })
+
+        return None
+
+    def _split_batch_log(self, job):
+        """Split the combined fio log into *.fiolog.json files.
+
+        Each stonewalled sub-case has its own item in the "jobs" array of
+        the json+ output, it will be saved with the other top level items
+        into a separate *.fiolog.json file named after the sub-case, next to
+        the combined fio log. The
+        "disk_util" is dropped since it covers the whole batch rather than
+        the sub-case, so that the disk utilization is reported as "NaN".
+
+        Args:
+            job: dict, the batch job.
+
+        Returns:
+            0: Passed
+            1: Failed
+
+        """
+        try:
+            with open(job['output'], 'r') as f:
+                content = f.read()
+
+            try:
+                json_data = json.loads(content)
+            except ValueError:
+                # Some messages (such as "note:" or "fio:" lines) may be
+                # written around the json block, locate the json block
+                begin = re.search(r'^{', content, re.M)
+                if not begin:
+                    raise
+                json_data = json.JSONDecoder().raw_decode(
+                    content, begin.start())[0]
+
+            for fio_job in json_data['jobs']:
+                case_data = dict(json_data)
+                case_data.pop('disk_util', None)
+                case_data['jobs'] = [fio_job]
+                output = '%s%s%s.fiolog.json' % (os.path.dirname(
+                    job['output']), os.sep, fio_job['jobname'])
+                with open(output, 'w') as f:
+                    json.dump(case_data, f, indent=4)
+
+        except Exception as err:
+            print('[ERROR] Error while splitting the fio log: %s' % err)
+            return 1
+
+        return 0
+
+    def _run_jobs(self, jobs):
+        """Run the specified jobs one by one."""
         total_num = len(self.jobs)
-        for job in self.jobs:
+        for job in jobs:
             # Show job information
-            jobnum += 1
             start_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())
             print('-' * 50)
-            print('Current Job  : %s / %s' % (jobnum, total_num))
+            print('Current Job  : %s / %s' % (job['jobnum'], total_num))
             print('Current Time : %s' % start_time)
             print('Pre Command  : %s' % job['pre_command'])
-            print('Test Command : %s' % job['command'])
+            print('Test Command : %s' % shlex.join(job['command']))
+            if 'jobfile' in job:
+                print('Job File     : %s' % job['jobfile'])
+                print(job['jobfile_content'])
             print('Post Command : %s' % job['post_command'])
             print('-' * 50)
 
             if self.dryrun is False:
-                # Create log directory
-                if not os.path.exists(self.path):
-                    os.makedirs(self.path)
-
                 # Execute current test
-                os.system(job['pre_command'])
-                os.system(job['command'])
-                os.system(job['post_command'])
+                subprocess.run(job['pre_command'], shell=True, check=False)
+                if 'jobfile' in job:
+                    with open(job['jobfile'], 'w') as f:
+                        f.write(job['jobfile_content'])
+                try:
+                    subprocess.run(job['command'], check=False)
+                except Exception as err:
+                    print('[ERROR] Error while running the fio command: %s' %
+                          err)
+                if 'jobfile' in job:
+                    self._split_batch_log(job)
+                subprocess.run(job['post_command'], shell=True, check=False)
             else:
                 time.sleep(0.2)
 
@@ -435,10 +747,58 @@ class FioTestRunner:
 
         return None
 
+    def start(self):
+        """Start to run all tests in the job list.
+
+        The jobs against the same device always run one by one. The jobs
+        against different devices run concurrently if parallel_devices > 1,
+        in which case the caches are dropped once before all of them.
+
+        """
+        if not self.jobs:
+            self._split_tests()
+
+        if not self.dryrun:
+            if self._check_passthrough_targets():
+                sys.exit(1)
+
+            # Create log directory
+            os.makedirs(self.path, exist_ok=True)
+
+        if not self._is_concurrent():
+            self._run_jobs(self.jobs)
+            return None
+
+        # Drop caches once, don't disturb the jobs running concurrently
+        command = 'sync; echo 3 > /proc/sys/vm/drop_caches'
+        print('Drop Caches  : %s' % command)
+        if self.dryrun:
+            self._run_jobs(self.jobs)
+            return None
+        subprocess.run(command, shell=True, check=False)
+
+        # Group the jobs by device
+        groups = {}
+        for job in self.jobs:
+            groups.setdefault(job['device'], []).append(job)
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.parallel_devices) as executor:
+            futures = [
+                executor.submit(self._run_jobs, jobs)
+                for jobs in groups.values()
+            ]
+            for future in futures:
+                future.result()
+
+        return None
 
-def get_cli_params(backend, driver, fs, rounds, filename, runtime, ioengine,
-                   direct, numjobs, rw_list, bs_list, iodepth_list, log_path,
-                   plots, dryrun):
+
+def get_cli_params(backend, driver, fs, rounds, filename, filename_list,
+                   parallel_devices, runtime, ioengine, hipri, fixedbufs,
+                   registerfiles, sqthread_poll, passthrough, direct, numjobs,
+                   rw_list, bs_list, iodepth_list, log_path, plots, dryrun,
+                   batch):
     """Get parameters from the CLI."""
     cli_params = {}
 
@@ -452,10 +812,24 @@ def get_cli_params(backend, driver, fs, rounds, filename, runtime, ioengine,
         cli_params['rounds'] = int(rounds)
     if filename is not None:
         cli_params['filename'] = filename
+    if filename_list is not None:
+        cli_params['filename_list'] = filename_list.split(',')
+    if parallel_devices is not None:
+        cli_params['parallel_devices'] = parallel_devices
     if runtime is not None:
         cli_params['runtime'] = runtime
     if ioengine is not None:
         cli_params['ioengine'] = ioengine
+    if hipri is not None:
+        cli_params['hipri'] = hipri
+    if fixedbufs is not None:
+        cli_params['fixedbufs'] = fixedbufs
+    if registerfiles is not None:
+        cli_params['registerfiles'] = registerfiles
+    if sqthread_poll is not None:
+        cli_params['sqthread_poll'] = sqthread_poll
+    if passthrough is not None:
+        cli_params['passthrough'] = passthrough
     if direct is not None:
         cli_params['direct'] = direct
     if numjobs is not None:
@@ -472,18 +846,27 @@ def get_cli_params(backend, driver, fs, rounds, filename, runtime, ioengine,
         cli_params['plots'] = plots
     if dryrun is not None:
         cli_params['dryrun'] = dryrun
+    if batch is not None:
+        cli_params['batch'] = batch
 
     return cli_params
 
 
+@functools.lru_cache(maxsize=1)
+def _load_yaml(path='./virt_perf_scripts.yaml'):
+    """Load the yaml file, use the C loader if there is."""
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=loader)
+
+
 def get_yaml_params():
     """Get parameters from the yaml file."""
     yaml_params = {}
 
     try:
-        with open('./virt_perf_scripts.yaml', 'r') as f:
-            yaml_dict = yaml.load(f)
-            yaml_params = yaml_dict['FioTestRunner']
+        # Copy it, so that the cached one won't be changed by the caller
+        yaml_params = dict(_load_yaml()['FioTestRunner'])
 
     except Exception as err:
         print('[WARNING] Fail to get default value from yaml file. %s' % err)
@@ -520,11 +903,46 @@ def run_fio_test(params={}):
     '--filename',
     help='[FIO] The disk(s) or specified file(s) to be tested by fio. You can \
 specify a number of targets by separating the names with a \':\' colon.')
+@click.option('--filename_list',
+              help='[FIO] The independent disk(s) or file(s) to be tested \
+by separated fio jobs. It takes precedence over the filename if specified.')
+@click.option('--parallel_devices',
+              type=click.IntRange(1, 1024),
+              help='How many devices in the filename_list will be tested \
+concurrently. If so, the caches are dropped once before all the tests, and \
+the CPU idleness and SAR logs are not collected.')
 @click.option('--runtime',
               help='[FIO] Terminate a job after the specified period of time.')
 @click.option('--ioengine',
               help='[FIO] Defines how the job issues I/O to the file. \
 Such as: \'libaio\', \'io_uring\', etc.')
+@click.option('--hipri/--no-hipri',
+              is_flag=True,
+              default=None,
+              help='[FIO] Use polled I/O \
+completions (io_uring only).')
+@click.option('--fixedbufs/--no-fixedbufs',
+              is_flag=True,
+              default=None,
+              help='[FIO] Use \
+pre-registered I/O buffers (io_uring only).')
+@click.option('--registerfiles/--no-registerfiles',
+              is_flag=True,
+              default=None,
+              help='[FIO] Register the \
+files with the kernel (io_uring only).')
+@click.option('--sqthread_poll/--no-sqthread_poll',
+              is_flag=True,
+              default=None,
+              help='[FIO] Offload \
+the submission to a kernel polling thread (io_uring only).')
+@click.option('--passthrough/--no-passthrough',
+              is_flag=True,
+              default=None,
+              help='[FIO] Use \
+io_uring_cmd to issue NVMe passthrough commands to the /dev/ng* devices. \
+Requires Linux 5.19 or later. Using --hipri or --fixedbufs with it requires \
+Linux 6.1 or later, and --hipri also requires nvme.poll_queues > 0.')
 @click.option('--direct',
               type=click.IntRange(0, 1),
               help='[FIO] Direct access to the disk.')
@@ -536,7 +954,8 @@ Such as: \'libaio\', \'io_uring\', etc.')
               help='[FIO] The block size in bytes used for I/O units.')
 @click.option('--iodepth_list',
               help='[FIO] # of I/O units to keep in flight against the file.')
-@click.option('--log_path', help='Where the *.fiolog files will be saved to.')
+@click.option('--log_path',
+              help='Where the *.fiolog.json files will be saved to.')
 @click.option('--plots/--no-plots',
               is_flag=True,
               default=None,
@@ -547,8 +966,17 @@ bw/iops/lat logs and plots in their lifetime.')
               default=None,
               help='Print the commands \
 that would be executed, but do not execute them.')
-def cli(backend, driver, fs, rounds, filename, runtime, ioengine, direct,
-        numjobs, rw_list, bs_list, iodepth_list, log_path, plots, dryrun):
+@click.option('--batch/--no-batch',
+              is_flag=True,
+              default=None,
+              help='Run all the \
+sub-cases in a single fio invocation. If so, the caches are dropped once per \
+batch rather than before each sub-case, the SAR logs are not collected, and \
+the disk utilization is not reported.')
+def cli(backend, driver, fs, rounds, filename, filename_list, parallel_devices,
+        runtime, ioengine, hipri, fixedbufs, registerfiles, sqthread_poll,
+        passthrough, direct, numjobs, rw_list, bs_list, iodepth_list, log_path,
+        plots, dryrun, batch):
     """Command line interface.
 
     Take arguments from CLI, load default parameters from yaml file.
@@ -556,9 +984,12 @@ def cli(backend, driver, fs, rounds, filename, runtime, ioengine, direct,
 
     """
     # Read user specified parameters from CLI
-    cli_params = get_cli_params(backend, driver, fs, rounds, filename, runtime,
-                                ioengine, direct, numjobs, rw_list, bs_list,
-                                iodepth_list, log_path, plots, dryrun)
+    cli_params = get_cli_params(backend, driver, fs, rounds, filename,
+                                filename_list, parallel_devices, runtime,
+                                ioengine, hipri, fixedbufs, registerfiles,
+                                sqthread_poll, passthrough, direct, numjobs,
+                                rw_list, bs_list, iodepth_list, log_path,
+                                plots, dryrun, batch)
 
     # Read user configuration from yaml file
     yaml_params = get_yaml_params()
@@ -571,7 +1002,7 @@ def cli(backend, driver, fs, rounds, filename, runtime, ioengine, direct,
     # Run fio test
     run_fio_test(params)
 
-    exit(0)
+    sys.exit(0)
 
 
 if __name__ == '__main__':
@@ -0,0 +1 @@
+fio --output-format=json+ --output=/tmp/r2/fio_NVME_SCSI_RAW_io_uring_batch_20261015065610/fio_NVME_SCSI_RAW_io_uring_batch_20261015065610.fiolog.batch /tmp/r2/fio_NVME_SCSI_RAW_io_uring_batch_20261015065610/fio_NVME_SCSI_RAW_io_uring_batch_20261015065610.fio
@@ -0,0 +1 @@
+fio --name=fio_NVME_SCSI_RAW_tmpa.img_io_uring_randread_4k_1_1_1_20261015065609 --filename=/tmp/a.img --size=80G --ioengine=io_uring --direct=1 --rw=randread --bs=4k --iodepth=1 --numjobs=1 --time_based --runtime=1m --group_reporting --output-format=json+ --output=/tmp/r1/fio_NVME_SCSI_RAW_tmpa.img_io_uring_randread_4k_1_1_1_20261015065609/fio_NVME_SCSI_RAW_tmpa.img_io_uring_randread_4k_1_1_1_20261015065609.fiolog.json '--description={"backend": "NVME", "driver": "SCSI", "format": "RAW", "round": 1}' --ramp_time=20
@@ -0,0 +1 @@
+fio --name=fio_NVME_SCSI_RAW_tmpb.img_io_uring_read_4k_1_1_1_20261015065609 --filename=/tmp/b.img --size=80G --ioengine=io_uring --direct=1 --rw=read --bs=4k --iodepth=1 --numjobs=1 --time_based --runtime=1m --group_reporting --output-format=json+ --output=/tmp/r1/fio_NVME_SCSI_RAW_tmpb.img_io_uring_read_4k_1_1_1_20261015065609/fio_NVME_SCSI_RAW_tmpb.img_io_uring_read_4k_1_1_1_20261015065609.fiolog.json '--description={"backend": "NVME", "driver": "SCSI", "format": "RAW", "round": 1}' --ramp_time=20
@@ -10,13 +10,94 @@ v0.3    2020-07-20  charles.shih  Adapt the script for virt_netperf_test.
 v0.4    2020-07-21  charles.shih  Add KPI TransRate.
 v0.5    2020-07-21  charles.shih  Modify KPI Throughput, MSize, RRSize.
 v0.6    2020-07-21  charles.shih  Adjust MSize, RRSize, add KPI Latency.
+v0.7    2026-10-15  charles.shih  Read the tarballs in memory.
+v0.8    2026-10-15  charles.shih  Load the log files in parallel.
+v0.9    2026-10-15  charles.shih  Parse the log files with orjson if there is.
+v0.10   2026-10-15  charles.shih  Generate the report DataFrame in one pass.
+v0.11   2026-10-15  charles.shih  Store the KPIs as numbers.
+v0.11.1 2026-10-15  charles.shih  Write the report to csv file directly.
+v0.12   2026-10-15  charles.shih  Extract the KPIs by a dispatch table.
+v0.13   2026-10-15  charles.shih  Extract the KPIs by Pandas in one shot.
+v0.13.1 2026-10-15  charles.shih  Collect the log files by os.scandir.
+v0.13.2 2026-10-15  charles.shih  Load a few log files serially, skip the
+                                  tarballs without *.nplog.json file.
 """
 
-import json
 import os
+import tarfile
+import concurrent.futures
 import click
 import pandas as pd
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+def _get_raw_data_from_netperf_log(data_file):
+    """Get the raw data from a specified netperf log file.
+
+    This function open a specified netperf log file and read the json
+    block. Then converts it into Python dict format and returns it.
+    If a tarball is specified, the *.nplog.json file will be read from
+    it in memory. It is defined at module level so that it can be run
+    by the worker processes.
+
+    Args:
+        data_file: string, the path to the netperf log file or tarball.
+
+    Returns:
+        This function returns a tuple like (result, raw_data):
+        result:
+            0: Passed
+            1: Failed
+        raw_data:
+            The raw data in Python dict format.
+
+    Raises:
+        1. Error while handling the new json file
+
+    """
+    # Parse required params
+    if data_file == '':
+        print('[ERROR] Missing required params: data_file')
+        return (1, None)
+
+    try:
+        if data_file.endswith('.tar.gz'):
+            # Tarball support
+            with tarfile.open(data_file, 'r:gz') as tf:
+                member = next(
+                    (m for m in tf if m.name.endswith('.nplog.json')), None)
+                if member is None:
+                    print('[WARNING] No *.nplog.json file in tarball: %s' %
+                          data_file)
+                    return (1, None)
+                raw_data = json_loads(tf.extractfile(member).read())
+        else:
+            with open(data_file, 'rb') as f:
+                raw_data = json_loads(f.read())
+    except Exception as err:
+        print('[ERROR] Error while handling the new json file: %s' % err)
+        return (1, None)
+
+    return (0, raw_data)
+
+
+# Load the log files in parallel only if there are more of them than this,
+# since starting the worker processes costs more than parsing a few logs.
+PARALLEL_LOAD_THRESHOLD = 32
+
+# The suffixes of the netperf log files (or tarballs).
+NETPERF_LOG_SUFFIXES = ('.nplog.json', '.tar.gz')
+
+# The netperf tests which report the throughput.
+STREAM_TESTS = ('TCP_STREAM', 'TCP_MAERTS', 'UDP_STREAM', 'UDP_MAERTS')
+
+# The netperf tests which report the transaction rate.
+RR_TESTS = ('TCP_RR', 'TCP_CRR', 'UDP_RR')
+
 
 class NetperfTestReporter():
     """Netperf Test Reporter.
@@ -28,7 +109,7 @@ class NetperfTestReporter():
 
     Attributes:
         raw_data_list: the list to store raw data.
-        perf_kpi_list: the list to store performance KPI tuples.
+        df_kpi: a DataFrame to store performance KPIs.
         df_report: a DataFrame to store the test report.
 
     """
@@ -37,78 +118,25 @@ class NetperfTestReporter():
     # Each item is a full data source (raw data) in Python dict format.
     raw_data_list = []
 
-    # The list of performance KPIs, which are extracted from the raw data.
-    # Each item represents a single netperf test results in Python dict format.
-    perf_kpi_list = []
+    # The DataFrame of performance KPIs, which are extracted from the raw data.
+    # Each row represents a single netperf test results.
+    df_kpi = None
 
     # The DataFrame to store performance KPIs for reporting, which is powered
     # by Pandas.
     df_report = None
 
-    def _byteify(self, inputs):
-        """Convert unicode to utf-8 string.
-
-        This function converts the unicode string to bytes.
-
-        Args:
-            inputs: the object which contain unicode.
-
-        Returns:
-            The byteify version of inputs.
-
-        """
-        if isinstance(inputs, dict):
-            return {
-                self._byteify(key): self._byteify(value)
-                for key, value in inputs.items()
-            }
-        elif isinstance(inputs, list):
-            return [self._byteify(element) for element in inputs]
-        elif isinstance(inputs, str):
-            return inputs.encode('utf-8')
-        else:
-            return inputs
-
-    def _get_raw_data_from_netperf_log(self, data_file):
-        """Get the raw data from a specified netperf log file.
-
-        This function open a specified netperf log file and read the json
-        block. Then converts it into Python dict format and returns it.
-
-        Args:
-            data_file: string, the path to the netperf log file.
-
-        Returns:
-            This function returns a tuple like (result, raw_data):
-            result:
-                0: Passed
-                1: Failed
-            raw_data:
-                The raw data in Python dict format.
-
-        Raises:
-            1. Error while handling the new json file
-
-        """
-        # Parse required params
-        if data_file == '':
-            print('[ERROR] Missing required params: data_file')
-            return (1, None)
-
-        try:
-            with open(data_file, 'r') as f:
-                json_data = json.load(f)
-                if '' == b'':
-                    # Convert to byteify for Python 2
-                    raw_data = self._byteify(json_data)
-                else:
-                    # Keep strings for Python 3
-                    raw_data = json_data
-        except Exception as err:
-            print('[ERROR] Error while handling the new json file: %s' % err)
-            return (1, None)
-
-        return (0, raw_data)
+    # The columns of the report DataFrame, and their display names.
+    RENAME_MAP = {
+        'driver': 'Driver',
+        'test': 'Test',
+        'msize': 'MSize',
+        'rrsize': 'RRSize',
+        'round': 'Round',
+        'throughput': 'Throughput(10^6bits/s)',
+        'transrate': 'TransRate(per sec)',
+        'latency': 'Latency(ms)'
+    }
 
     def load_raw_data_from_netperf_logs(self, params={}):
         """Load raw data from netperf log files.
@@ -133,104 +161,34 @@ class NetperfTestReporter():
             print('[ERROR] Missing required params: params[result_path]')
             return 1
 
-        # Load raw data from files
-        for fname in os.listdir(params['result_path']):
-            filename = params['result_path'] + os.sep + fname
+        # Collect the log files (or tarballs)
+        filenames = []
+        with os.scandir(params['result_path']) as it:
+            for entry in it:
+                if entry.name.endswith(NETPERF_LOG_SUFFIXES) and (
+                        entry.is_file()):
+                    filenames.append(entry.path)
+
+        # Load raw data from files, in parallel if there are many of them
+        if len(filenames) > PARALLEL_LOAD_THRESHOLD:
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                results = list(
+                    executor.map(_get_raw_data_from_netperf_log, filenames))
+        else:
+            results = map(_get_raw_data_from_netperf_log, filenames)
 
-            # Tarball support
-            tmpfolder = '/tmp/netperf-report.tmp'
-            if filename.endswith('.tar.gz') and os.path.isfile(filename):
-                os.system('mkdir -p {0}'.format(tmpfolder))
-                os.system('tar xf {1} -C {0}'.format(tmpfolder, filename))
-                filename = tmpfolder + os.sep + fname.replace(
-                    '.tar.gz', '.nplog.json')
-
-            # Load raw data
-            if filename.endswith('.nplog.json') and os.path.isfile(filename):
-                (result,
-                 raw_data) = self._get_raw_data_from_netperf_log(filename)
-                if result == 0:
-                    self.raw_data_list.append(raw_data)
-
-            # Tarball support, cleanup
-            os.system('[ -e {0} ] && rm -rf {0}'.format(tmpfolder))
+        for (result, raw_data) in results:
+            if result == 0:
+                self.raw_data_list.append(raw_data)
 
         return 0
 
-    def _get_kpis_from_raw_data(self, raw_data):
-        """Get KPIs from a specified raw data.
-
-        This function get the performance KPIs from a specified tuple of raw
-        data. It converts the units and format the values so that people can
-        read them easily.
-
-        Args:
-            raw_data: dict, the specified raw data.
-
-        Returns:
-            This function returns a tuple like (result, perf_kpi):
-            result:
-                0: Passed
-                1: Failed
-            perf_kpi:
-                The performance KPIs in Python dict format.
-
-        Raises:
-            1. Error while extracting performance KPIs
-
-        """
-        # Parse required params
-        if raw_data == '':
-            print('[ERROR] Missing required params: raw_data')
-            return (1, None)
-
-        # Get the performance KPIs
-        perf_kpi = {}
-
-        metadata = raw_data['metadata']
-        perf_kpi['driver'] = metadata['DRIVER']
-        perf_kpi['round'] = metadata['ROUNDS']
-        perf_kpi['test'] = metadata['NAME']
-
-        series_meta = metadata['SERIES_META']
-        for name in series_meta.keys():
-            if name in ('TCP_STREAM', 'TCP_MAERTS', 'UDP_STREAM',
-                        'UDP_MAERTS'):
-
-                # Message / RR size
-                perf_kpi['msize'] = metadata['M_SIZE']
-                perf_kpi['rrsize'] = '0'
-
-                # Bandwidth in "Mbits/s".
-                unit = series_meta[name]['THROUGHPUT_UNITS']
-                if unit != '10^6bits/s':
-                    raise Exception('Bandwidth unit is not "10^6bits/s".')
-                perf_kpi['throughput'] = series_meta[name]['THROUGHPUT']
-                perf_kpi['transrate'] = 'NaN'
-
-                # Latency in "ms"
-                perf_kpi['latency'] = series_meta[name]['MEAN_LATENCY']
-
-            elif name in ('TCP_RR', 'TCP_CRR', 'UDP_RR'):
-
-                # Message / RR size
-                perf_kpi['msize'] = '0'
-                perf_kpi['rrsize'] = metadata['RR_SIZE']
-
-                # Bandwidth in "Mbits/s".
-                perf_kpi['throughput'] = 'NaN'
-                perf_kpi['transrate'] = series_meta[name]['TRANSACTION_RATE']
-
-                # Latency in "ms"
-                perf_kpi['latency'] = series_meta[name]['MEAN_LATENCY']
-
-        return (0, perf_kpi)
-
     def calculate_performance_kpis(self, params={}):
         """Calculate performance KPIs.
 
-        This function calculates performance KPIs from self.raw_data_list and
-        stores the performance KPI tuples into self.perf_kpi_list.
+        This function flattens self.raw_data_list into a DataFrame and
+        calculates performance KPIs from its columns. The test name in the
+        metadata is used to locate its SERIES_META.
 
         As data source, the following attributes should be ready to use:
         1. self.raw_data_list: the list of raw data (Python dict format)
@@ -244,96 +202,83 @@ class NetperfTestReporter():
             1: Failed
 
         Updates:
-            self.perf_kpi_list: store the performance KPI tuples.
-
-        """
-        # Calculate performance KPIs
-        for raw_data in self.raw_data_list:
-            (result, perf_kpi) = self._get_kpis_from_raw_data(raw_data)
-            if result == 0:
-                self.perf_kpi_list.append(perf_kpi)
-            else:
-                return 1
-
-        return 0
-
-    def _create_report_dataframe(self):
-        """Create report DataFrame.
-
-        This function creates the report DataFrame by reading the performance
-        KPIs list.
-
-        As data source, the following attributes should be ready to use:
-        1. self.perf_kpi_list: the list of performance KPIs.
-
-        Updates:
-            self.df_report: the report DataFrame.
-
-        """
-        # Create report DataFrame from self.perf_kpi_list
-        self.df_report = pd.DataFrame(self.perf_kpi_list,
-                                      columns=[
-                                          'driver', 'test', 'msize', 'rrsize',
-                                          'round', 'throughput', 'transrate',
-                                          'latency'
-                                      ])
-
-        # Rename the columns of the report DataFrame
-        self.df_report.rename(columns={
-            'driver': 'Driver',
-            'test': 'Test',
-            'msize': 'MSize',
-            'rrsize': 'RRSize',
-            'round': 'Round',
-            'throughput': 'Throughput(10^6bits/s)',
-            'transrate': 'TransRate(per sec)',
-            'latency': 'Latency(ms)'
-        },
-                              inplace=True)
-
-        return None
+            self.df_kpi: store the performance KPIs.
 
-    def _format_report_dataframe(self):
-        """Format report DataFrame.
-
-        This function sorts and formats the report DataFrame.
-
-        As data source, the following attributes should be ready to use:
-        1. self.df_report: the report DataFrame.
-
-        Updates:
-            self.df_report: the report DataFrame.
+        Raises:
+            1. Error while extracting performance KPIs
 
         """
-        # Sort the report DataFrame and reset its index
-        self.df_report = self.df_report.sort_values(
-            by=['Driver', 'Test', 'MSize', 'RRSize', 'Round'])
+        if not self.raw_data_list:
+            self.df_kpi = pd.DataFrame(columns=list(self.RENAME_MAP))
+            return 0
 
-        self.df_report = self.df_report.reset_index().drop(columns=['index'])
+        try:
+            df = pd.json_normalize(self.raw_data_list)
+            name = df['metadata.NAME']
+            is_stream = name.isin(STREAM_TESTS)
+            is_rr = name.isin(RR_TESTS)
+
+            def get_series(key):
+                """Get the values of SERIES_META.<NAME>.<key>."""
+                series = pd.Series(None, index=df.index, dtype=object)
+                for test in name.unique():
+                    column = 'metadata.SERIES_META.%s.%s' % (test, key)
+                    if column in df.columns:
+                        series[name == test] = df.loc[name == test, column]
+                return series
+
+            # Bandwidth in "Mbits/s".
+            units = get_series('THROUGHPUT_UNITS')
+            if (units[is_stream] != '10^6bits/s').any():
+                raise Exception('Bandwidth unit is not "10^6bits/s".')
+
+            self.df_kpi = pd.DataFrame({
+                'driver': df['metadata.DRIVER'],
+                'test': name,
+                # Message / RR size
+                'msize': pd.to_numeric(df['metadata.M_SIZE'].where(
+                    is_stream, 0)).astype(int),
+                'rrsize': df['metadata.RR_SIZE'].where(is_rr, '0'),
+                'round': df['metadata.ROUNDS'],
+                'throughput': pd.to_numeric(
+                    get_series('THROUGHPUT').where(is_stream)),
+                'transrate': pd.to_numeric(
+                    get_series('TRANSACTION_RATE').where(is_rr)),
+                # Latency in "ms"
+                'latency': pd.to_numeric(get_series('MEAN_LATENCY'))
+            })
 
-        # Format the KPI values
-        self.df_report = self.df_report.round(4)
+        except Exception as err:
+            print('[ERROR] Error while extracting performance KPIs: %s' % err)
+            return 1
 
-        return None
+        return 0
 
     def generate_report_dataframe(self):
         """Generate the report DataFrame.
 
         This function generates the report DataFrame by reading the
-        performance KPIs list.
+        performance KPIs. Then it sorts and formats the DataFrame.
 
         As data source, the following attributes should be ready to use:
-        1. self.perf_kpi_list: the list of performance KPIs.
+        1. self.df_kpi: the DataFrame of performance KPIs.
 
         Updates:
             self.df_report: the report DataFrame.
 
         """
-        # Create DataFrame
-        self._create_report_dataframe()
+        # Create report DataFrame from self.df_kpi
+        self.df_report = self.df_kpi.rename(columns=self.RENAME_MAP)
 
-        # Format DataFrame
-        self._format_report_dataframe()
+        # Sort the report DataFrame and reset its index
+        self.df_report.sort_values(
+            by=['Driver', 'Test', 'MSize', 'RRSize', 'Round'],
+            inplace=True,
+            ignore_index=True)
+
+        # Format the KPI values
+        num_cols = self.df_report.select_dtypes('number').columns
+        self.df_report[num_cols] = self.df_report[num_cols].round(4)
 
         return None
 
@@ -363,9 +308,7 @@ class NetperfTestReporter():
         try:
             print('[NOTE] Dumping data into csv file "%s"...' %
                   params['report_csv'])
-            content = self.df_report.to_csv()
-            with open(params['report_csv'], 'w') as f:
-                f.write(content)
+            self.df_report.to_csv(params['report_csv'], na_rep='NaN')
             print('[NOTE] Finished!')
 
         except Exception as err:
@@ -16,11 +16,17 @@
 History:
 v0.1    2020-05-20  charles.shih  Init version.
 v0.2    2020-07-02  charles.shih  Basic function completed.
+v0.3    2026-10-15  charles.shih  Remove the dead code for Python 2.
+v0.4    2026-10-15  charles.shih  Extract the tarballs into a temporary
+                                  directory by tarfile.
 """
 
 import json
 import re
 import os
+import shutil
+import tarfile
+import tempfile
 import click
 import pandas as pd
 
@@ -52,30 +58,6 @@ class FlentTestReporter():
     # by Pandas.
     df_report = None
 
-    def _byteify(self, inputs):
-        """Convert unicode to utf-8 string.
-
-        This function converts the unicode string to bytes.
-
-        Args:
-            inputs: the object which contain unicode.
-
-        Returns:
-            The byteify version of inputs.
-
-        """
-        if isinstance(inputs, dict):
-            return {
-                self._byteify(key): self._byteify(value)
-                for key, value in inputs.items()
-            }
-        elif isinstance(inputs, list):
-            return [self._byteify(element) for element in inputs]
-        elif isinstance(inputs, str):
-            return inputs.encode('utf-8')
-        else:
-            return inputs
-
     def _get_raw_data_from_flent_log(self, data_file):
         """Get the raw data from a specified flent log file.
 
@@ -104,13 +86,7 @@ class FlentTestReporter():
 
         try:
             with open(data_file, 'r') as f:
-                json_data = json.load(f)
-                if '' == b'':
-                    # Convert to byteify for Python 2
-                    raw_data = self._byteify(json_data)
-                else:
-                    # Keep strings for Python 3
-                    raw_data = json_data
+                raw_data = json.load(f)
         except Exception as err:
             print('[ERROR] Error while handling the new json file: %s' % err)
             return (1, None)
@@ -140,30 +116,52 @@ class FlentTestReporter():
             print('[ERROR] Missing required params: params[result_path]')
             return 1
 
-        # Load raw data from files
-        for fname in os.listdir(params['result_path']):
-            filename = params['result_path'] + os.sep + fname
+        # Load raw data from files, the temporary files will be removed
+        # along with the tmpfolder
+        with tempfile.TemporaryDirectory(prefix='flent-report-') as tmpfolder:
+            for fname in os.listdir(params['result_path']):
+                filename = params['result_path'] + os.sep + fname
 
-            # Tarball support
-            tmpfolder = '/tmp/flent-report.tmp'
-            if filename.endswith('.tar.gz') and os.path.isfile(filename):
-                os.system('mkdir -p {0}'.format(tmpfolder))
-                os.system('tar xf {1} -C {0}'.format(tmpfolder, filename))
-                filename = tmpfolder + os.sep + fname.replace(
-                    '.tar.gz', '.flent')
+                # Tarball support
+                if filename.endswith('.tar.gz') and os.path.isfile(filename):
+                    filename = self._extract_flent_log(filename, tmpfolder)
 
-            # Load raw data
-            if filename.endswith('.flent') and os.path.isfile(filename):
-                (result,
-                 raw_data) = self._get_raw_data_from_flent_log(filename)
-                if result == 0:
-                    self.raw_data_list.append(raw_data)
-
-            # Tarball support, cleanup
-            os.system('[ -e {0} ] && rm -rf {0}'.format(tmpfolder))
+                # Load raw data
+                if filename.endswith('.flent') and os.path.isfile(filename):
+                    (result,
+                     raw_data) = self._get_raw_data_from_flent_log(filename)
+                    if result == 0:
+                        self.raw_data_list.append(raw_data)
 
         return 0
 
+    def _extract_flent_log(self, tarball, path):
+        """Extract the flent log file from a specified tarball.
+
+        The *.flent file named after the tarball will be extracted into the
+        specified path.
+
+        Args:
+            tarball: string, the path to the tarball.
+            path: string, the path to extract the flent log file to.
+
+        Returns:
+            The path to the extracted flent log file, or '' if not found.
+
+        """
+        try:
+            with tarfile.open(tarball, 'r:gz') as tf:
+                name = os.path.basename(tarball).replace('.tar.gz', '.flent')
+                if name in tf.getnames():
+                    filename = path + os.sep + name
+                    with open(filename, 'wb') as f:
+                        shutil.copyfileobj(tf.extractfile(name), f)
+                    return filename
+        except Exception as err:
+            print('[ERROR] Error while extracting the tarball: %s' % err)
+
+        return ''
+
     def _get_kpis_from_raw_data(self, raw_data):
         """Get KPIs from a specified raw data.
 